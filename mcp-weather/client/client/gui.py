@@ -6,9 +6,11 @@ from __future__ import annotations
 
 import logging
 import tkinter as tk
+from concurrent.futures import Future
 from datetime import datetime
+from functools import lru_cache
 from tkinter import messagebox, ttk
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastmcp.exceptions import ToolError
 
@@ -17,9 +19,87 @@ from .mcp_client import WeatherMCPClient
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _parse_iso(text: str) -> str:
+    """
+    Format an ISO-8601 timestamp for display, caching repeated refreshes.
+    """
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return text
+    return dt.strftime("%d/%m %H:%M")
+
+
+# (key, metric suffix, imperial suffix) for the numeric weather fields.
+_TEMPERATURE_FIELD = ("temperature", "°C", "°F")
+_WIND_FIELD = ("wind_speed", "km/h", "mph")
+_PRECIP_FIELD = ("precipitation", "mm", "in")
+_HUMIDITY_FIELD = ("humidity", "%", "%")
+
+
+def _format_float(
+    data: Dict[str, Any],
+    field: Tuple[str, str, str],
+    unit: str,
+    fmt: str = "{:.1f} {}",
+) -> str:
+    """
+    Format a numeric field with the suffix of the active unit system.
+    """
+    key, metric_suffix, imperial_suffix = field
+    value = data.get(key)
+    if value is None:
+        return "--"
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return "--"
+    return fmt.format(value, metric_suffix if unit == "metric" else imperial_suffix)
+
+
+_FORECAST_METRIC_SUFFIXES = (_TEMPERATURE_FIELD[1], _WIND_FIELD[1], _PRECIP_FIELD[1])
+_FORECAST_IMPERIAL_SUFFIXES = (_TEMPERATURE_FIELD[2], _WIND_FIELD[2], _PRECIP_FIELD[2])
+
+
+def _forecast_row(
+    time_text: str, entry: Dict[str, Any], unit: str
+) -> Tuple[str, str, str, str]:
+    """
+    Build the Treeview values of one forecast row in a single call.
+
+    Rows with a missing or non-numeric field fall back to _format_float
+    per column so those cells still render as "--".
+    """
+    get = entry.get
+    try:
+        temperature = float(get("temperature"))
+        wind = float(get("wind_speed"))
+        precip = float(get("precipitation"))
+    except (TypeError, ValueError):
+        return (
+            time_text,
+            _format_float(entry, _TEMPERATURE_FIELD, unit),
+            _format_float(entry, _WIND_FIELD, unit),
+            _format_float(entry, _PRECIP_FIELD, unit),
+        )
+    temp_suffix, wind_suffix, precip_suffix = (
+        _FORECAST_METRIC_SUFFIXES if unit == "metric" else _FORECAST_IMPERIAL_SUFFIXES
+    )
+    return (
+        time_text,
+        f"{temperature:.1f} {temp_suffix}",
+        f"{wind:.1f} {wind_suffix}",
+        f"{precip:.1f} {precip_suffix}",
+    )
+
+
 class WeatherApp:
     def __init__(self, root: tk.Tk) -> None:
         self.root = root
+        self._after = root.after
         self.root.title("MCP Weather")
         self.root.geometry("900x640")
 
@@ -40,6 +120,9 @@ class WeatherApp:
         self.city_results: List[Dict[str, Any]] = []
         self.selected_city: Optional[Dict[str, Any]] = None
         self._refresh_job: Optional[str] = None
+        self._weather_future: Optional[Future] = None
+        self._pending: Dict[str, Any] = {}
+        self._flush_scheduled = False
 
         self._build_ui()
         self._bind_events()
@@ -87,6 +170,7 @@ class WeatherApp:
         )
         scrollbar.grid(row=0, column=1, sticky="ns")
         self.city_listbox.config(yscrollcommand=scrollbar.set)
+        self._list_insert = self.city_listbox.insert
 
         current_frame = ttk.LabelFrame(self.root, text="Clima actual")
         current_frame.grid(row=2, column=0, sticky="ew", padx=12, pady=8)
@@ -144,6 +228,8 @@ class WeatherApp:
         )
         tree_scroll.grid(row=0, column=1, sticky="ns")
         self.forecast_tree.configure(yscrollcommand=tree_scroll.set)
+        self._tree_update = self.forecast_tree.item
+        self._tree_insert = self.forecast_tree.insert
 
         controls_frame = ttk.Frame(self.root)
         controls_frame.grid(row=4, column=0, sticky="ew", padx=12, pady=8)
@@ -202,10 +288,12 @@ class WeatherApp:
     def _handle_search_results(self, results: List[Dict[str, Any]]) -> None:
         self.city_results = results
         self.city_listbox.delete(0, tk.END)
-        for item in results:
-            display = f"{item.get('name', 'N/A')} - {item.get('country', '--')}"
-            self.city_listbox.insert(tk.END, display)
         if results:
+            displays = [
+                f"{item.get('name', 'N/A')} - {item.get('country', '--')}"
+                for item in results
+            ]
+            self._list_insert(tk.END, *displays)
             self.status_var.set(f"{len(results)} resultados encontrados.")
             self.city_listbox.selection_clear(0, tk.END)
             self.city_listbox.selection_set(0)
@@ -241,38 +329,69 @@ class WeatherApp:
         unit = self.unit_var.get()
         hours = 24
         self.status_var.set("Consultando clima…")
+        # Tool calls run concurrently, so an older request can finish last;
+        # cancel it and let only the latest one update the display.
+        if self._weather_future is not None:
+            self._weather_future.cancel()
         future = self.client.fetch_weather_bundle(lat, lon, hours=hours, unit=unit)
-        self._attach_future(future, on_success=self._update_weather_display)
+        self._weather_future = future
+        self._attach_future(
+            future,
+            on_success=lambda bundle: self._on_weather_bundle(future, bundle),
+        )
+
+    def _on_weather_bundle(self, future: Future, bundle: Dict[str, Any]) -> None:
+        if future is not self._weather_future:
+            logger.debug("Respuesta de clima descartada por una consulta más reciente.")
+            return
+        self._weather_future = None
+        self._update_weather_display(bundle)
 
     def _update_weather_display(self, bundle: Dict[str, Any]) -> None:
         current = bundle.get("current") or {}
         forecast = bundle.get("forecast") or []
         unit = current.get("unit", self.unit_var.get())
-        self.current_vars["temperature"].set(self._format_temperature(current, unit))
-        self.current_vars["wind"].set(self._format_wind(current, unit))
-        self.current_vars["humidity"].set(self._format_humidity(current))
-        self.current_vars["time"].set(self._format_time(current.get("time")))
-        self._populate_forecast(forecast, unit)
+        self._pending.update(
+            temperature=_format_float(current, _TEMPERATURE_FIELD, unit),
+            wind=_format_float(current, _WIND_FIELD, unit),
+            humidity=_format_float(current, _HUMIDITY_FIELD, unit, "{:.0f}{}"),
+            time=self._format_time(current.get("time")),
+            forecast=(forecast, unit),
+        )
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.root.after_idle(self._flush_pending)
         self.status_var.set("Clima actualizado correctamente.")
         self._schedule_refresh()
 
+    def _flush_pending(self) -> None:
+        """
+        Apply every pending widget write in a single idle pass.
+        """
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        forecast = pending.pop("forecast", None)
+        for key, text in pending.items():
+            self.current_vars[key].set(text)
+        if forecast is not None:
+            self._populate_forecast(*forecast)
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
     def _attach_future(self, future, *, on_success=None, on_error=None):
         def _callback(fut):
+            if fut.cancelled():
+                return
             try:
                 result = fut.result()
             except Exception as exc:  # pylint: disable=broad-except
                 logger.exception("Error en operación MCP", exc_info=exc)
-                self.root.after(
-                    0,
-                    lambda err=exc: self._handle_error(err, on_error),
-                )
+                self._after(0, lambda err=exc: self._handle_error(err, on_error))
             else:
                 if on_success:
-                    self.root.after(0, lambda: on_success(result))
+                    self._after(0, lambda: on_success(result))
 
         future.add_done_callback(_callback)
 
@@ -291,7 +410,7 @@ class WeatherApp:
             self.root.after_cancel(self._refresh_job)
         minutes = max(1, self.auto_refresh_var.get())
         interval_ms = minutes * 60 * 1000
-        self._refresh_job = self.root.after(interval_ms, self._refresh_weather)
+        self._refresh_job = self._after(interval_ms, self._refresh_weather)
 
     def _on_refresh_interval_change(self) -> None:
         if self.selected_city:
@@ -302,19 +421,29 @@ class WeatherApp:
             var.set("--")
 
     def _clear_forecast(self) -> None:
-        for row in self.forecast_tree.get_children():
-            self.forecast_tree.delete(row)
+        rows = self.forecast_tree.get_children()
+        if rows:
+            self.forecast_tree.delete(*rows)
 
     def _populate_forecast(self, entries: List[Dict[str, Any]], unit: str) -> None:
-        self._clear_forecast()
-        for entry in entries:
-            values = (
-                self._format_time(entry.get("time")),
-                self._format_temperature(entry, unit),
-                self._format_wind(entry, unit),
-                self._format_precip(entry, unit),
+        # Rows use stable iids so refreshes update them in place instead of
+        # deleting and re-inserting every item.
+        update_row = self._tree_update
+        insert_row = self._tree_insert
+        end = tk.END
+        format_time = self._format_time
+
+        existing = len(self.forecast_tree.get_children())
+        for index, entry in enumerate(entries):
+            values = _forecast_row(format_time(entry.get("time")), entry, unit)
+            if index < existing:
+                update_row(f"row{index}", values=values)
+            else:
+                insert_row("", end, iid=f"row{index}", values=values)
+        if existing > len(entries):
+            self.forecast_tree.delete(
+                *(f"row{index}" for index in range(len(entries), existing))
             )
-            self.forecast_tree.insert("", tk.END, values=values)
 
     @staticmethod
     def _format_time(value: Any) -> str:
@@ -322,60 +451,7 @@ class WeatherApp:
             return "--"
         if isinstance(value, (int, float)):
             return str(value)
-        text = str(value)
-        text = text.replace("Z", "+00:00")
-        try:
-            dt = datetime.fromisoformat(text)
-        except ValueError:
-            return text
-        return dt.strftime("%d/%m %H:%M")
-
-    @staticmethod
-    def _format_temperature(data: Dict[str, Any], unit: str) -> str:
-        value = data.get("temperature")
-        if value is None:
-            return "--"
-        try:
-            value = float(value)
-        except (TypeError, ValueError):
-            return "--"
-        suffix = "°C" if unit == "metric" else "°F"
-        return f"{value:.1f} {suffix}"
-
-    @staticmethod
-    def _format_wind(data: Dict[str, Any], unit: str) -> str:
-        value = data.get("wind_speed")
-        if value is None:
-            return "--"
-        try:
-            value = float(value)
-        except (TypeError, ValueError):
-            return "--"
-        suffix = "km/h" if unit == "metric" else "mph"
-        return f"{value:.1f} {suffix}"
-
-    @staticmethod
-    def _format_precip(data: Dict[str, Any], unit: str) -> str:
-        value = data.get("precipitation")
-        if value is None:
-            return "--"
-        try:
-            value = float(value)
-        except (TypeError, ValueError):
-            return "--"
-        suffix = "mm" if unit == "metric" else "in"
-        return f"{value:.1f} {suffix}"
-
-    @staticmethod
-    def _format_humidity(data: Dict[str, Any]) -> str:
-        value = data.get("humidity")
-        if value is None:
-            return "--"
-        try:
-            value = float(value)
-        except (TypeError, ValueError):
-            return "--"
-        return f"{value:.0f}%"
+        return _parse_iso(str(value))
 
     # ------------------------------------------------------------------
     # Lifecycle
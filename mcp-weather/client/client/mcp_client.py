@@ -10,7 +10,6 @@ from concurrent.futures import Future
 from typing import Any, Awaitable, Iterable, Sequence
 from dataclasses import is_dataclass, asdict
 import json
-import ast
 import logging
 
 from fastmcp.client import Client
@@ -19,16 +18,38 @@ from fastmcp.exceptions import ToolError
 
 from .subprocess_utils import create_stdio_transport
 
+try:  # uvloop is not available on Windows; fall back to the stdlib loop.
+    import uvloop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+else:
+    _new_event_loop = uvloop.new_event_loop
+
+try:
+    import orjson
+except ImportError:
+    _json_loads = json.loads
+else:
+    _json_loads = orjson.loads
+
 DEFAULT_TIMEOUT = 30
 logger = logging.getLogger(__name__)
 
+# JSON-native scalars returned as-is by _normalize_payload.
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
 
 def _normalize_payload(value: Any) -> Any:
     """
     Convert Pydantic/BaseModel/iterables into plain Python structures.
     """
-    if value is None:
-        return None
+    value_type = type(value)
+    if value_type is dict:
+        return {key: _normalize_payload(val) for key, val in value.items()}
+    if value_type is list:
+        return [_normalize_payload(item) for item in value]
+    if value_type in _PLAIN_TYPES:
+        return value
     if hasattr(value, "model_dump"):
         return value.model_dump()
     if hasattr(value, "dict"):
@@ -57,11 +78,12 @@ class WeatherMCPClient:
     """
 
     def __init__(self) -> None:
-        self._loop = asyncio.new_event_loop()
+        self._loop = _new_event_loop()
         self._loop_ready = threading.Event()
         self._thread = threading.Thread(target=self._loop_worker, daemon=True)
-        self._lock: asyncio.Lock | None = None
         self._client: Client | None = None
+        self._session: asyncio.Task[Client] | None = None
+        self._reconnect_lock: asyncio.Lock | None = None
         self._shutdown = False
 
         self._thread.start()
@@ -75,7 +97,8 @@ class WeatherMCPClient:
         asyncio.set_event_loop(self._loop)
         transport = create_stdio_transport(keep_alive=True)
         self._client = Client(transport=transport, name="mcp-weather-gui")
-        self._lock = asyncio.Lock()
+        self._session = self._loop.create_task(self._open_session())
+        self._reconnect_lock = asyncio.Lock()
         self._loop_ready.set()
 
         try:
@@ -96,10 +119,49 @@ class WeatherMCPClient:
             raise RuntimeError("El cliente MCP aún no está inicializado.")
         return self._client
 
-    def _ensure_lock(self) -> asyncio.Lock:
-        if self._lock is None:
+    async def _open_session(self) -> Client:
+        """
+        Enter the client context once so every call reuses the same MCP session.
+        """
+        client = self._ensure_client()
+        await client.__aenter__()
+        return client
+
+    def _session_alive(self) -> bool:
+        session = self._session
+        if session is None or not session.done():
+            return True
+        if session.cancelled() or session.exception() is not None:
+            return False
+        return self._ensure_client().is_connected()
+
+    async def _ensure_session(self) -> Client:
+        if self._session is None or self._reconnect_lock is None:
             raise RuntimeError("El cliente MCP aún no está inicializado.")
-        return self._lock
+        if not self._session_alive():
+            async with self._reconnect_lock:
+                # Calls waiting on the lock reuse the handshake started first.
+                if not self._session_alive():
+                    await self._reopen_session()
+        return await self._session
+
+    async def _reopen_session(self) -> None:
+        """
+        Replace a failed or disconnected session with a new handshake.
+        """
+        session = self._session
+        if (
+            session is not None
+            and not session.cancelled()
+            and session.exception() is None
+        ):
+            # The context was entered but the server went away; leave it first.
+            try:
+                await self._ensure_client().__aexit__(None, None, None)
+            except Exception:  # pylint: disable=broad-except
+                logger.debug("Error cerrando la sesión MCP anterior", exc_info=True)
+        logger.info("Reabriendo la sesión MCP")
+        self._session = self._loop.create_task(self._open_session())
 
     @staticmethod
     def _unwrap_result(result: CallToolResult) -> Any:
@@ -115,10 +177,14 @@ class WeatherMCPClient:
         if len(contents) == 1:
             text = contents[0]
             try:
-                return json.loads(text)
-            except json.JSONDecodeError:
+                return _json_loads(text)
+            except ValueError:
+                logger.warning("Respuesta no JSON del servidor, se intenta como literal.")
+                import ast  # Only needed for this rare fallback.
+
                 try:
-                    return ast.literal_eval(text)
+                    # literal_eval can yield tuples or sets; flatten them to lists.
+                    return _normalize_payload(ast.literal_eval(text))
                 except (ValueError, SyntaxError):
                     pass
         return contents
@@ -174,23 +240,17 @@ class WeatherMCPClient:
     # ------------------------------------------------------------------
 
     async def _warmup_async(self) -> Sequence[Any]:
-        client = self._ensure_client()
-        lock = self._ensure_lock()
-        async with lock:
-            async with client:
-                tools = await client.list_tools()
-                return tuple(tool.name for tool in tools)
+        client = await self._ensure_session()
+        tools = await client.list_tools()
+        return tuple(tool.name for tool in tools)
 
     async def _search_cities_async(self, query: str) -> list[dict[str, Any]]:
-        client = self._ensure_client()
-        lock = self._ensure_lock()
-        async with lock:
-            async with client:
-                result = await client.call_tool(
-                    "search_city",
-                    {"query": query},
-                    timeout=DEFAULT_TIMEOUT,
-                )
+        client = await self._ensure_session()
+        result = await client.call_tool(
+            "search_city",
+            {"query": query},
+            timeout=DEFAULT_TIMEOUT,
+        )
         data = self._unwrap_result(result)
         if isinstance(data, list):
             return data
@@ -206,29 +266,26 @@ class WeatherMCPClient:
         hours: int,
         unit: str,
     ) -> dict[str, Any]:
-        client = self._ensure_client()
-        lock = self._ensure_lock()
-        async with lock:
-            async with client:
-                current_result = await client.call_tool(
-                    "current_weather",
-                    {"lat": lat, "lon": lon, "unit": unit},
-                    timeout=DEFAULT_TIMEOUT,
-                )
-                forecast_result = await client.call_tool(
-                    "forecast",
-                    {"lat": lat, "lon": lon, "hours": hours, "unit": unit},
-                    timeout=DEFAULT_TIMEOUT,
-                )
+        client = await self._ensure_session()
+        current_result, forecast_result = await asyncio.gather(
+            client.call_tool(
+                "current_weather",
+                {"lat": lat, "lon": lon, "unit": unit},
+                timeout=DEFAULT_TIMEOUT,
+            ),
+            client.call_tool(
+                "forecast",
+                {"lat": lat, "lon": lon, "hours": hours, "unit": unit},
+                timeout=DEFAULT_TIMEOUT,
+            ),
+        )
 
+        # _unwrap_result already yields plain structures, no second pass needed.
         current_payload = self._unwrap_result(current_result)
         forecast_payload = self._unwrap_result(forecast_result)
         logger.debug("Clima actual bruto recibido: %r", current_payload)
         logger.debug("Pronóstico bruto recibido: %r", forecast_payload)
 
-        current_payload = _normalize_payload(current_payload)
-        forecast_payload = _normalize_payload(forecast_payload)
-
         if not isinstance(current_payload, dict):
             if isinstance(current_payload, Iterable) and not isinstance(
                 current_payload, (str, bytes)
@@ -254,10 +311,15 @@ class WeatherMCPClient:
         }
 
     async def _shutdown_async(self) -> None:
-        lock = self._ensure_lock()
         client = self._ensure_client()
-        async with lock:
-            await client.close()
+        if (
+            self._session is not None
+            and self._session.done()
+            and not self._session.cancelled()
+            and self._session.exception() is None
+        ):
+            await client.__aexit__(None, None, None)
+        await client.close()
 
 
 __all__ = ["WeatherMCPClient"]
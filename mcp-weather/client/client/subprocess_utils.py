@@ -4,6 +4,7 @@ Utilities for launching and terminating the MCP weather server subprocess.
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import subprocess
@@ -17,19 +18,29 @@ logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
+if os.name == "nt":
+    _VENV_PYTHON = os.path.join("Scripts", "python.exe")
+else:
+    _VENV_PYTHON = os.path.join("bin", "python")
 
+# Virtual environment interpreters probed in order before the current one.
+PYTHON_CANDIDATES = tuple(
+    os.path.join(PROJECT_ROOT, venv, _VENV_PYTHON) for venv in (".venv", "venv")
+)
+
+
+@functools.lru_cache(maxsize=1)
 def detect_python_executable() -> str:
     """
     Return the Python executable to use for spawning the server.
-    Prefers a local .venv if available, otherwise falls back to the current interpreter.
+    Prefers a local .venv or venv if available, otherwise falls back to the current
+    interpreter. The result is cached so respawning the server does not probe the
+    filesystem again.
     """
-    if os.name == "nt":
-        candidate = PROJECT_ROOT / ".venv" / "Scripts" / "python.exe"
-    else:
-        candidate = PROJECT_ROOT / ".venv" / "bin" / "python"
-    if candidate.exists():
-        logger.debug("Usando intérprete de la venv: %s", candidate)
-        return str(candidate)
+    for candidate in PYTHON_CANDIDATES:
+        if os.path.isfile(candidate):
+            logger.debug("Usando intérprete de la venv: %s", candidate)
+            return candidate
     logger.debug("Usando intérprete actual: %s", sys.executable)
     return sys.executable
 
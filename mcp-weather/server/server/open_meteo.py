@@ -5,14 +5,29 @@ Convenience wrappers for Open-Meteo's public APIs.
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
-from typing import Any, Literal
+from types import MappingProxyType
+from urllib.parse import urlencode
+from typing import Any, Literal, Mapping
 
 import requests
+from cachetools import LRUCache, TTLCache, cached
+from cachetools.keys import hashkey
 from requests import Session
 from requests.adapters import HTTPAdapter
+from urllib3 import exceptions as urllib3_exceptions
 from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:
+    import json
+
+    _json_loads = json.loads
+else:
+    _json_loads = orjson.loads
+
 logger = logging.getLogger(__name__)
 
 UnitSystem = Literal["metric", "imperial"]
@@ -22,52 +37,118 @@ FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
 DEFAULT_TIMEOUT = 10
 MAX_RESULTS = 8
+POOL_SIZE = 32
+
+# Open-Meteo refreshes its data roughly every 15 minutes and coordinates
+# rounded to 0.01° fall in the same grid cell, so short-lived caching per
+# rounded location returns the same readings the API would.
+WEATHER_CACHE_TTL = 600
+WEATHER_CACHE_SIZE = 4096
+COORDINATE_PRECISION = 2
 
 
 class OpenMeteoError(RuntimeError):
     """Raised when Open-Meteo cannot satisfy a request."""
 
 
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+)
+# A single adapter owns one urllib3 PoolManager for both schemes and is
+# reused by any session this module creates.
+_ADAPTER = HTTPAdapter(
+    max_retries=_RETRY,
+    pool_connections=POOL_SIZE,
+    pool_maxsize=POOL_SIZE,
+)
+
+
 def _configure_session() -> Session:
     session = requests.Session()
-    retry = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=("GET",),
-    )
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
+    # requests already sends keep-alive and gzip/deflate headers by default.
+    session.headers["Accept"] = "application/json"
+    session.mount("https://", _ADAPTER)
+    session.mount("http://", _ADAPTER)
     return session
 
 
 session = _configure_session()
+_session_get = session.get
+_current_cache: TTLCache = TTLCache(maxsize=WEATHER_CACHE_SIZE, ttl=WEATHER_CACHE_TTL)
+_forecast_cache: TTLCache = TTLCache(maxsize=WEATHER_CACHE_SIZE, ttl=WEATHER_CACHE_TTL)
 
 
-def _request_json(url: str, params: dict[str, Any]) -> dict[str, Any]:
+def _request_json(url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
     """
     Perform a GET request and return the parsed JSON response.
     """
     try:
-        response = session.get(url, params=params, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-    except requests.Timeout as exc:
+        response = _session_get(
+            url, params=params, timeout=DEFAULT_TIMEOUT, stream=True
+        )
+        try:
+            response.raise_for_status()
+            # Read the decoded body in one go instead of letting requests
+            # assemble response.content from 10 KB chunks.
+            body = response.raw.read(decode_content=True)
+        finally:
+            response.close()
+        return _json_loads(body)
+    except (requests.Timeout, urllib3_exceptions.TimeoutError) as exc:
         raise OpenMeteoError("La consulta a Open-Meteo excedió el tiempo de espera.") from exc
-    except requests.RequestException as exc:
+    except (requests.RequestException, urllib3_exceptions.HTTPError) as exc:
         raise OpenMeteoError(f"No se pudo contactar Open-Meteo: {exc}") from exc
-
-    try:
-        data = response.json()
     except ValueError as exc:
+        # orjson and json decode errors are ValueError subclasses. This clause
+        # must follow RequestException, some of which also derive from ValueError.
         raise OpenMeteoError("Open-Meteo devolvió una respuesta inválida.") from exc
-    return data
+
+
+def _parse_candidate(candidate: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Build a city result from a geocoding candidate, or None if it lacks coordinates.
+    """
+    try:
+        latitude = candidate["latitude"]
+        longitude = candidate["longitude"]
+        # The decoder already yields floats; only coerce anything else.
+        if type(latitude) is not float:
+            latitude = float(latitude)
+        if type(longitude) is not float:
+            longitude = float(longitude)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {
+        "name": candidate.get("name", "").strip() or "Sin nombre",
+        "country": candidate.get("country", "N/A"),
+        "lat": latitude,
+        "lon": longitude,
+    }
 
 
 def geocode(query: str, *, limit: int = MAX_RESULTS) -> list[dict[str, Any]]:
     """
     Resolve a free-text query into candidate cities with coordinates.
+    Results are cached per case-insensitive query; callers always get fresh copies.
     """
+    results = _geocode_cached(query.strip(), limit)
+    return [dict(result) for result in results]
+
+
+# Only the cache key is casefolded; Open-Meteo receives the query as typed.
+@cached(
+    LRUCache(maxsize=512),
+    key=lambda query, limit: hashkey(query.casefold(), limit),
+    lock=threading.Lock(),
+)
+def _geocode_cached(query: str, limit: int) -> tuple[dict[str, Any], ...]:
+    return tuple(_geocode_uncached(query, limit))
+
+
+def _geocode_uncached(query: str, limit: int) -> list[dict[str, Any]]:
     params = {
         "name": query,
         "count": limit,
@@ -76,22 +157,11 @@ def geocode(query: str, *, limit: int = MAX_RESULTS) -> list[dict[str, Any]]:
     }
     payload = _request_json(GEOCODE_URL, params)
     candidates = payload.get("results") or []
-    results: list[dict[str, Any]] = []
-
-    for candidate in candidates:
-        try:
-            latitude = float(candidate["latitude"])
-            longitude = float(candidate["longitude"])
-        except (KeyError, TypeError, ValueError):
-            continue
-        results.append(
-            {
-                "name": candidate.get("name", "").strip() or "Sin nombre",
-                "country": candidate.get("country", "N/A"),
-                "lat": latitude,
-                "lon": longitude,
-            }
-        )
+    results = [
+        result
+        for candidate in candidates
+        if (result := _parse_candidate(candidate)) is not None
+    ]
 
     if not results:
         logger.info("Geocodificación sin resultados para %s", query)
@@ -99,48 +169,87 @@ def geocode(query: str, *, limit: int = MAX_RESULTS) -> list[dict[str, Any]]:
     return results
 
 
-def _unit_params(unit: UnitSystem) -> dict[str, str]:
-    if unit == "imperial":
-        return {
-            "temperature_unit": "fahrenheit",
-            "wind_speed_unit": "mph",
-            "precipitation_unit": "inch",
-        }
-    return {
+_METRIC_PARAMS = MappingProxyType(
+    {
         "temperature_unit": "celsius",
         "wind_speed_unit": "kmh",
         "precipitation_unit": "mm",
     }
+)
+_IMPERIAL_PARAMS = MappingProxyType(
+    {
+        "temperature_unit": "fahrenheit",
+        "wind_speed_unit": "mph",
+        "precipitation_unit": "inch",
+    }
+)
+_UNIT_PARAMS = MappingProxyType({"metric": _METRIC_PARAMS, "imperial": _IMPERIAL_PARAMS})
+
+_CURRENT_BASE = MappingProxyType(
+    {
+        "current": "temperature_2m,relative_humidity_2m,wind_speed_10m",
+        "timezone": "auto",
+    }
+)
+_FORECAST_BASE = MappingProxyType(
+    {
+        "hourly": "temperature_2m,wind_speed_10m,precipitation",
+        "timezone": "auto",
+    }
+)
+
+
+def _static_queries(base: Mapping[str, str]) -> Mapping[str, str]:
+    """
+    Pre-encode the fixed query parameters of an endpoint for each unit system.
+    """
+    return MappingProxyType(
+        {
+            unit: urlencode({**base, **unit_params}, safe=",")
+            for unit, unit_params in _UNIT_PARAMS.items()
+        }
+    )
+
+
+# Only the coordinates (and forecast days) vary per request, so the rest of
+# each query string is encoded once here.
+_CURRENT_QUERY = _static_queries(_CURRENT_BASE)
+_FORECAST_QUERY = _static_queries(_FORECAST_BASE)
 
 
 def get_current(lat: float, lon: float, unit: UnitSystem) -> dict[str, Any]:
     """
     Fetch current weather metrics for the provided coordinates.
+    Results are cached for a few minutes per rounded coordinate pair.
     """
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "current": "temperature_2m,relative_humidity_2m,wind_speed_10m",
-        "timezone": "auto",
-        **_unit_params(unit),
-    }
-    payload = _request_json(FORECAST_URL, params)
+    current = _fetch_current(
+        round(lat, COORDINATE_PRECISION), round(lon, COORDINATE_PRECISION), unit
+    )
+    return dict(current)
+
+
+@cached(_current_cache, lock=threading.Lock())
+def _fetch_current(lat: float, lon: float, unit: UnitSystem) -> dict[str, Any]:
+    query = _CURRENT_QUERY.get(unit, _CURRENT_QUERY["metric"])
+    payload = _request_json(f"{FORECAST_URL}?latitude={lat}&longitude={lon}&{query}")
     current = payload.get("current")
     if not current:
         raise OpenMeteoError("No hay datos de clima actual para estas coordenadas.")
 
     try:
-        temperature = float(current["temperature_2m"])
-        wind_speed = float(current["wind_speed_10m"])
+        temperature = current["temperature_2m"]
+        wind_speed = current["wind_speed_10m"]
+        # The decoder already yields floats; only coerce anything else.
+        if type(temperature) is not float:
+            temperature = float(temperature)
+        if type(wind_speed) is not float:
+            wind_speed = float(wind_speed)
     except (KeyError, TypeError, ValueError) as exc:
         raise OpenMeteoError("Datos incompletos de clima actual.") from exc
 
     humidity_raw = current.get("relative_humidity_2m")
-    humidity: float | None
-    try:
-        humidity = float(humidity_raw) if humidity_raw is not None else None
-    except (TypeError, ValueError):
-        humidity = None
+    # Open-Meteo reports humidity as an integer percentage.
+    humidity = float(humidity_raw) if isinstance(humidity_raw, (int, float)) else None
 
     return {
         "temperature": temperature,
@@ -151,20 +260,52 @@ def get_current(lat: float, lon: float, unit: UnitSystem) -> dict[str, Any]:
     }
 
 
+def _forecast_entry(
+    time: Any, temperature: Any, wind_speed: Any, precip: Any, unit: UnitSystem
+) -> dict[str, Any] | None:
+    """
+    Build one forecast row, or return None when a value is not numeric.
+    """
+    # Open-Meteo already sends floats; only coerce the odd int or string.
+    try:
+        return {
+            "time": str(time),
+            "temperature": temperature if type(temperature) is float else float(temperature),
+            "wind_speed": wind_speed if type(wind_speed) is float else float(wind_speed),
+            "precipitation": precip if type(precip) is float else float(precip),
+            "unit": unit,
+        }
+    except (TypeError, ValueError):
+        return None
+
+
 def get_forecast(
     lat: float, lon: float, hours: int, unit: UnitSystem
 ) -> list[dict[str, Any]]:
     """
     Fetch hourly forecast entries limited to a number of hours.
+    Results are cached for a few minutes per rounded coordinate pair.
     """
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": "temperature_2m,wind_speed_10m,precipitation",
-        "timezone": "auto",
-        **_unit_params(unit),
-    }
-    payload = _request_json(FORECAST_URL, params)
+    entries = _fetch_forecast(
+        round(lat, COORDINATE_PRECISION),
+        round(lon, COORDINATE_PRECISION),
+        hours,
+        unit,
+    )
+    return [dict(entry) for entry in entries]
+
+
+@cached(_forecast_cache, lock=threading.Lock())
+def _fetch_forecast(
+    lat: float, lon: float, hours: int, unit: UnitSystem
+) -> tuple[dict[str, Any], ...]:
+    query = _FORECAST_QUERY.get(unit, _FORECAST_QUERY["metric"])
+    # Hourly data starts at local midnight, so whole days cover the window.
+    forecast_days = max(1, (hours + 23) // 24)
+    payload = _request_json(
+        f"{FORECAST_URL}?latitude={lat}&longitude={lon}"
+        f"&forecast_days={forecast_days}&{query}"
+    )
     hourly = payload.get("hourly")
     if not hourly:
         raise OpenMeteoError("No hay datos de pronóstico para estas coordenadas.")
@@ -174,30 +315,21 @@ def get_forecast(
     wind_speeds = hourly.get("wind_speed_10m") or []
     precipitation = hourly.get("precipitation") or []
 
-    entries: list[dict[str, Any]] = []
-    limit = min(hours, len(times))
-
-    for index in range(limit):
-        try:
-            temperature = float(temperatures[index])
-            wind_speed = float(wind_speeds[index])
-            precip = float(precipitation[index])
-        except (TypeError, ValueError, IndexError):
-            continue
-        entries.append(
-            {
-                "time": str(times[index]),
-                "temperature": temperature,
-                "wind_speed": wind_speed,
-                "precipitation": precip,
-                "unit": unit,
-            }
+    entries = [
+        entry
+        for row in zip(
+            times[:hours],
+            temperatures[:hours],
+            wind_speeds[:hours],
+            precipitation[:hours],
         )
+        if (entry := _forecast_entry(*row, unit)) is not None
+    ]
 
     if not entries:
         raise OpenMeteoError("No se pudieron construir datos de pronóstico utilizables.")
 
-    return entries
+    return tuple(entries)
 
 
 __all__ = ["UnitSystem", "OpenMeteoError", "geocode", "get_current", "get_forecast"]
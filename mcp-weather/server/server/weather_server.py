@@ -4,6 +4,8 @@ FastMCP server exposing weather-related tools backed by Open-Meteo.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 from typing import Literal, TypedDict, cast
 
@@ -21,6 +23,9 @@ logger = logging.getLogger(__name__)
 
 UnitSystem = Literal["metric", "imperial"]
 
+_METRIC_ALIASES = frozenset({"metric", "m", "si"})
+_IMPERIAL_ALIASES = frozenset({"imperial", "i", "us"})
+
 
 class CityResult(TypedDict):
     name: str
@@ -46,25 +51,37 @@ class ForecastEntry(TypedDict):
 
 
 def _normalize_unit(unit: str | None) -> UnitSystem:
-    if not unit:
+    # The tools default to "metric", so exact matches skip normalization.
+    if not unit or unit == "metric":
         return "metric"
+    if unit == "imperial":
+        return "imperial"
+    return _normalize_unit_alias(unit)
+
+
+@functools.lru_cache(maxsize=32)
+def _normalize_unit_alias(unit: str) -> UnitSystem:
     normalized = unit.strip().lower()
-    if normalized in {"metric", "m", "si"}:
+    if normalized in _METRIC_ALIASES:
         return "metric"
-    if normalized in {"imperial", "i", "us"}:
+    if normalized in _IMPERIAL_ALIASES:
         return "imperial"
     raise ToolError("Unidad no soportada. Usa 'metric' o 'imperial'.")
 
 
 def _validate_coordinates(lat: float, lon: float) -> tuple[float, float]:
-    try:
-        lat_value = float(lat)
-        lon_value = float(lon)
-    except (TypeError, ValueError) as exc:
-        raise ToolError("Las coordenadas deben ser numéricas.") from exc
-    if not -90.0 <= lat_value <= 90.0:
-        raise ToolError("Latitud fuera de rango (-90 a 90).")
-    if not -180.0 <= lon_value <= 180.0:
+    if type(lat) is float and type(lon) is float:
+        # FastMCP has already coerced the declared float arguments.
+        lat_value, lon_value = lat, lon
+    else:
+        try:
+            lat_value = float(lat)
+            lon_value = float(lon)
+        except (TypeError, ValueError) as exc:
+            raise ToolError("Las coordenadas deben ser numéricas.") from exc
+    if not (-90.0 <= lat_value <= 90.0 and -180.0 <= lon_value <= 180.0):
+        if not -90.0 <= lat_value <= 90.0:
+            raise ToolError("Latitud fuera de rango (-90 a 90).")
         raise ToolError("Longitud fuera de rango (-180 a 180).")
     return lat_value, lon_value
 
@@ -98,7 +115,7 @@ def create_weather_server() -> FastMCP:
         ),
         title="Buscar ciudad",
     )
-    def search_city(context: Context, query: str) -> list[CityResult]:
+    async def search_city(context: Context, query: str) -> list[CityResult]:
         if query is None or not query.strip():
             raise ToolError("El parámetro 'query' es obligatorio.")
 
@@ -106,7 +123,7 @@ def create_weather_server() -> FastMCP:
         logger.info("Buscando ciudad: %s", cleaned_query)
 
         try:
-            results = geocode(cleaned_query)
+            results = await asyncio.to_thread(geocode, cleaned_query)
         except OpenMeteoError as exc:
             logger.error("Error en geocodificación: %s", exc)
             raise ToolError(str(exc)) from exc
@@ -122,7 +139,7 @@ def create_weather_server() -> FastMCP:
         ),
         title="Clima actual",
     )
-    def current_weather(
+    async def current_weather(
         context: Context, lat: float, lon: float, unit: str = "metric"
     ) -> CurrentWeatherResult:
         normalized_unit = _normalize_unit(unit)
@@ -136,7 +153,9 @@ def create_weather_server() -> FastMCP:
         )
 
         try:
-            current = get_current(latitude, longitude, normalized_unit)
+            current = await asyncio.to_thread(
+                get_current, latitude, longitude, normalized_unit
+            )
         except OpenMeteoError as exc:
             logger.error("Error obteniendo clima actual: %s", exc)
             raise ToolError(str(exc)) from exc
@@ -151,7 +170,7 @@ def create_weather_server() -> FastMCP:
         ),
         title="Pronóstico horario",
     )
-    def forecast(
+    async def forecast(
         context: Context,
         lat: float,
         lon: float,
@@ -171,7 +190,9 @@ def create_weather_server() -> FastMCP:
         )
 
         try:
-            forecast_data = get_forecast(latitude, longitude, limit_hours, normalized_unit)
+            forecast_data = await asyncio.to_thread(
+                get_forecast, latitude, longitude, limit_hours, normalized_unit
+            )
         except OpenMeteoError as exc:
             logger.error("Error obteniendo pronóstico: %s", exc)
             raise ToolError(str(exc)) from exc